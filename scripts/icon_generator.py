@@ -0,0 +1,260 @@
+"""Icon generation with Nano Banana Pro, shared by ui-revamp.py and generate-missing-icons.py"""
+
+import os
+import re
+import asyncio
+import functools
+import io
+import shutil
+import subprocess
+from collections import Counter
+from pathlib import Path
+
+import httpx
+from aiolimiter import AsyncLimiter
+from google import genai
+from google.genai import errors, types
+from PIL import Image, ImageChops
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from icons_config import ICON_PROMPT_SUFFIX
+
+# Reuse one keep-alive HTTP/2 connection pool for every request
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60)
+
+# Max number of icon requests in flight at once
+MAX_CONCURRENT_REQUESTS = 4
+
+# Buffered write sizes for saving generated images
+WRITE_BUFFER_SIZE = 1024 * 1024
+WRITE_CHUNK_SIZE = 256 * 1024
+
+# Palette size for quantized icon PNGs (icons are single-color art)
+PNG_PALETTE_COLORS = 16
+
+# Channel difference from the background above which a pixel counts as icon ink
+TRACE_THRESHOLD = 48
+
+# Border colors covering at least this share of the border are treated as background
+BACKGROUND_MIN_SHARE = 0.02
+
+# Masks outside these ink ratios (whole image / outer 5% band) mean the background was not separated
+MIN_INK_RATIO = 0.01
+MAX_INK_RATIO = 0.9
+MAX_BORDER_INK_RATIO = 0.05
+
+# Combined SVG sprite written next to the icon PNGs
+SPRITE_FILENAME = "sprite.svg"
+
+# Max request rate (requests per second) sent to the image API
+limiter = AsyncLimiter(max_rate=5, time_period=1)
+
+def create_client(api_key: str) -> genai.Client:
+    """Create a Gemini client pinned to prebuilt httpx clients sharing one HTTP/2 connection pool"""
+    # timeout=None matches the SDK default; image generation can take well over httpx's 5 s default
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            httpx_client=httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=None),
+            httpx_async_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=None),
+        ),
+    )
+
+def is_retryable(e: BaseException) -> bool:
+    """Retry on rate limiting (429) and server-side (5xx) errors"""
+    return isinstance(e, errors.APIError) and (e.code == 429 or e.code >= 500)
+
+@retry(
+    retry=retry_if_exception(is_retryable),
+    wait=wait_exponential(),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+async def request_image(client: genai.Client, prompt: str):
+    async with limiter:
+        return await client.aio.models.generate_content(
+            model="gemini-3-pro-image-preview",
+            contents=[prompt + ICON_PROMPT_SUFFIX],
+            config=types.GenerateContentConfig(
+                response_modalities=["IMAGE"],
+                image_config=types.ImageConfig(aspect_ratio="1:1"),
+            )
+        )
+
+def optimize_png(image_data: bytes) -> bytes:
+    """Re-encode an image as an 8-bit palette PNG with maximum compression"""
+    img = Image.open(io.BytesIO(image_data)).convert("RGBA")
+    img = img.quantize(colors=PNG_PALETTE_COLORS, method=Image.Quantize.FASTOCTREE)
+    out = io.BytesIO()
+    img.save(out, "PNG", optimize=True, compress_level=9)
+    return out.getvalue()
+
+def save_optimized(image_path: Path, image_data: bytes):
+    """Optimize freshly generated image bytes and write them atomically"""
+    atomic_write(image_path, optimize_png(image_data))
+
+def optimize_existing(image_path: Path) -> bool:
+    """Re-encode an icon already on disk unless it is already a palette PNG, returning whether it changed"""
+    with Image.open(image_path) as img:
+        if img.format == "PNG" and img.mode == "P":
+            return False
+    atomic_write(image_path, optimize_png(image_path.read_bytes()))
+    return True
+
+def atomic_write(path: Path, data: bytes):
+    """Write bytes via a temp file so a crash never leaves a partial file behind"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    mv = memoryview(data)
+    try:
+        with open(tmp_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            for i in range(0, len(mv), WRITE_CHUNK_SIZE):
+                f.write(mv[i:i + WRITE_CHUNK_SIZE])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave stray .tmp files in public/icons (Vite ships that folder as-is)
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+async def generate_icon(client: genai.Client, name: str, config: dict, output_dir: Path, sem: asyncio.Semaphore, force: bool = False):
+    """Generate a single icon using Nano Banana Pro (skips icons already on disk unless force)"""
+    image_path = output_dir / config["filename"]
+    if not force and image_path.exists() and image_path.stat().st_size > 0:
+        print(f"  Skipping {name} (exists)")
+        try:
+            # Quantizing a full-size icon takes ~200 ms, so keep it off the event loop
+            if await asyncio.to_thread(optimize_existing, image_path):
+                print(f"    Optimized existing {config['filename']}")
+        except Exception as e:
+            print(f"    Warning: could not optimize {config['filename']}: {e}")
+        return True
+
+    try:
+        async with sem:
+            print(f"  Generating {name} icon...")
+            response = await request_image(client, config["prompt"])
+
+        part = next((p for p in response.candidates[0].content.parts if p.inline_data is not None), None)
+        if part is None:
+            print(f"    Warning: No image generated for {name}")
+            return False
+
+        await asyncio.to_thread(save_optimized, image_path, part.inline_data.data)
+        print(f"    Saved: {config['filename']}")
+        return True
+
+    except Exception as e:
+        print(f"    Error generating {name}: {e}")
+        return False
+
+async def generate_all_icons(client: genai.Client, icons: dict, output_dir: Path, force: bool = False):
+    """Generate the given icons concurrently using Nano Banana Pro, returning the number that failed"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Output directory: {output_dir}\n")
+
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    results = await asyncio.gather(*[
+        generate_icon(client, name, config, output_dir, sem, force)
+        for name, config in icons.items()
+    ])
+
+    successful = sum(results)
+    failed = len(results) - successful
+
+    print(f"\nIcon Generation Complete!")
+    print(f"  Successful: {successful}")
+    print(f"  Failed: {failed}")
+
+    return failed
+
+def border_colors(img: Image.Image) -> list:
+    """Colors making up at least BACKGROUND_MIN_SHARE of the image border (covers checkerboard backgrounds)"""
+    w, h = img.size
+    strips = [img.crop((0, 0, w, 1)), img.crop((0, h - 1, w, h)), img.crop((0, 0, 1, h)), img.crop((w - 1, 0, w, h))]
+    counts = Counter(px for strip in strips for px in strip.getdata())
+    total = sum(counts.values())
+    colors = [c for c, n in counts.most_common() if n >= BACKGROUND_MIN_SHARE * total]
+    return colors or [counts.most_common(1)[0][0]]
+
+def icon_mask(image_path: Path) -> Image.Image:
+    """Build a 1-bit mask of the icon shape (black ink on white), raising ValueError if segmentation looks wrong"""
+    img = Image.open(image_path).convert("RGBA")
+    alpha = img.getchannel("A")
+    if alpha.getextrema()[0] < 255:
+        # Real transparency: the alpha channel is the shape
+        mask = alpha.point(lambda v: 0 if v >= 128 else 255, mode="1")
+    else:
+        # Opaque image: ink is anything far from every background color sampled on the border
+        rgb = img.convert("RGB")
+        distance = None
+        for color in border_colors(rgb):
+            diff = functools.reduce(ImageChops.lighter, ImageChops.difference(rgb, Image.new("RGB", rgb.size, color)).split())
+            distance = diff if distance is None else ImageChops.darker(distance, diff)
+        mask = distance.point(lambda v: 0 if v > TRACE_THRESHOLD else 255, mode="1")
+
+    w, h = mask.size
+    ink = mask.histogram()[0]
+    ink_ratio = ink / (w * h)
+    if not MIN_INK_RATIO <= ink_ratio <= MAX_INK_RATIO:
+        raise ValueError(f"icon covers {ink_ratio:.0%} of the image, background not separated")
+
+    band = max(1, min(w, h) // 20)
+    inner_ink = mask.crop((band, band, w - band, h - band)).histogram()[0]
+    border_ratio = (ink - inner_ink) / (w * h - (w - 2 * band) * (h - 2 * band))
+    if border_ratio > MAX_BORDER_INK_RATIO:
+        raise ValueError(f"{border_ratio:.0%} of the image border is ink, background not separated")
+
+    return mask
+
+def icon_mask_bmp(image_path: Path) -> bytes:
+    """Encode the icon mask as a BMP for potrace"""
+    out = io.BytesIO()
+    icon_mask(image_path).save(out, "BMP")
+    return out.getvalue()
+
+def trace_icon(image_path: Path):
+    """Trace an icon PNG with potrace, returning its (viewBox, <g> markup) filled with currentColor"""
+    result = subprocess.run(
+        ["potrace", "--svg", "--output", "-", "-"],
+        input=icon_mask_bmp(image_path),
+        capture_output=True,
+        check=True,
+    )
+    svg = result.stdout.decode()
+    view_box = re.search(r'viewBox="([^"]+)"', svg)
+    group = re.search(r"<g\b.*</g>", svg, re.DOTALL)
+    if view_box is None or group is None:
+        raise ValueError("unexpected potrace output (no viewBox or <g> element)")
+    return view_box.group(1), group.group(0).replace('fill="#000000"', 'fill="currentColor"')
+
+def build_sprite(icons: dict, output_dir: Path):
+    """Trace every icon PNG on disk into a single <symbol> sprite sheet, returning the traced icon names ([] if not written)"""
+    if shutil.which("potrace") is None:
+        print("  Warning: potrace not found, skipping SVG sprite")
+        return []
+
+    symbols = []
+    traced = []
+    for name, config in icons.items():
+        image_path = output_dir / config["filename"]
+        if not image_path.exists():
+            print(f"    Warning: {config['filename']} missing, left out of sprite")
+            continue
+        try:
+            view_box, group = trace_icon(image_path)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            print(f"    Warning: {name} left out of sprite: {e}")
+            continue
+        symbols.append(f'  <symbol id="{name}" viewBox="{view_box}">\n    {group}\n  </symbol>')
+        traced.append(name)
+
+    if not symbols:
+        print("  Warning: no icons traced, keeping existing SVG sprite")
+        return []
+
+    sprite = '<svg xmlns="http://www.w3.org/2000/svg">\n' + "\n".join(symbols) + "\n</svg>\n"
+    sprite_path = output_dir / SPRITE_FILENAME
+    atomic_write(sprite_path, sprite.encode())
+    print(f"  Saved sprite: {SPRITE_FILENAME} ({len(symbols)} icons)")
+    return traced
@@ -0,0 +1,73 @@
+"""Icon definitions shared by ui-revamp.py and generate-missing-icons.py"""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ICONS_DIR = REPO_ROOT / "public" / "icons"
+
+# Icons to generate (emoji -> description for icon generation)
+ICONS = {
+    "practice": {
+        "emoji": "🎯",
+        "prompt": "A minimal, modern gaming icon representing practice mode. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple target or crosshair design.",
+        "filename": "practice-icon.png"
+    },
+    "fullgame": {
+        "emoji": "🏆",
+        "prompt": "A minimal, modern gaming icon representing a full game or tournament. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple trophy or championship cup design.",
+        "filename": "fullgame-icon.png"
+    },
+    "tutorial": {
+        "emoji": "📚",
+        "prompt": "A minimal, modern icon representing a tutorial or learning. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple book or education symbol.",
+        "filename": "tutorial-icon.png"
+    },
+    "interactive": {
+        "emoji": "🎮",
+        "prompt": "A minimal, modern gaming icon representing interactive gameplay. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple game controller or play symbol.",
+        "filename": "interactive-icon.png"
+    },
+    "cards": {
+        "emoji": "🃏",
+        "prompt": "A minimal, modern icon representing playing cards. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple card or deck symbol.",
+        "filename": "cards-icon.png"
+    },
+    "chips": {
+        "emoji": "💰",
+        "prompt": "A minimal, modern icon representing poker chips or money. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple chip stack or coin symbol.",
+        "filename": "chips-icon.png"
+    },
+    "winner": {
+        "emoji": "👑",
+        "prompt": "A minimal, modern icon representing a winner or champion. Single color gold/yellow icon on transparent background, clean vector style, suitable for dark UI. Simple crown design.",
+        "filename": "winner-icon.png"
+    },
+    "fold": {
+        "emoji": "🚫",
+        "prompt": "A minimal, modern icon representing fold action in poker. Single color red icon on transparent background, clean vector style, suitable for dark UI. Simple X or stop symbol.",
+        "filename": "fold-icon.png"
+    },
+    "check": {
+        "emoji": "✓",
+        "prompt": "A minimal, modern icon representing check action in poker. Single color green icon on transparent background, clean vector style, suitable for dark UI. Simple checkmark.",
+        "filename": "check-icon.png"
+    },
+    "raise": {
+        "emoji": "⬆️",
+        "prompt": "A minimal, modern icon representing raise action in poker. Single color blue icon on transparent background, clean vector style, suitable for dark UI. Simple upward arrow.",
+        "filename": "raise-icon.png"
+    },
+    "allin": {
+        "emoji": "🔥",
+        "prompt": "A minimal, modern icon representing all-in action in poker. Single color orange/red icon on transparent background, clean vector style, suitable for dark UI. Simple flame or explosion symbol.",
+        "filename": "allin-icon.png"
+    },
+    "position": {
+        "emoji": "📍",
+        "prompt": "A minimal, modern icon representing table position in poker. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple position marker or seat indicator.",
+        "filename": "position-icon.png"
+    }
+}
+
+# Appended to every icon prompt to keep generated images small
+ICON_PROMPT_SUFFIX = " 128x128 pixels, low detail."
@@ -3,28 +3,29 @@
 UI Revamp Script using Gemini 3 Pro and Nano Banana Pro
 - Gemini 3 Pro: Analyzes UI and suggests improvements
 - Nano Banana Pro: Generates icons to replace emojis
+
+Install dependencies with: pip install -r scripts/requirements.txt
 """
 
 import os
 import sys
-import json
+import asyncio
+import argparse
 import base64
-from pathlib import Path
+import functools
+import hashlib
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-try:
-    from google import genai
-    from google.genai import types
-except ImportError:
-    print("Installing google-genai package...")
-    os.system("pip install google-genai python-dotenv pillow")
-    from google import genai
-    from google.genai import types
+from google.genai import types
+import orjson
+from pydantic import BaseModel
 
-from PIL import Image
+import icon_generator
+from icon_generator import atomic_write, create_client
+from icons_config import ICONS, ICONS_DIR, REPO_ROOT
 
 # Initialize client
 API_KEY = os.getenv("GEMINI_API_KEY")
@@ -32,80 +33,53 @@ if not API_KEY:
     print("Error: GEMINI_API_KEY not found in .env file")
     sys.exit(1)
 
-client = genai.Client(api_key=API_KEY)
-
-# Icons to generate (emoji -> description for icon generation)
-ICONS_TO_GENERATE = {
-    "practice": {
-        "emoji": "🎯",
-        "prompt": "A minimal, modern gaming icon representing practice mode. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple target or crosshair design.",
-        "filename": "practice-icon.png"
-    },
-    "fullgame": {
-        "emoji": "🏆",
-        "prompt": "A minimal, modern gaming icon representing a full game or tournament. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple trophy or championship cup design.",
-        "filename": "fullgame-icon.png"
-    },
-    "tutorial": {
-        "emoji": "📚",
-        "prompt": "A minimal, modern icon representing a tutorial or learning. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple book or education symbol.",
-        "filename": "tutorial-icon.png"
-    },
-    "interactive": {
-        "emoji": "🎮",
-        "prompt": "A minimal, modern gaming icon representing interactive gameplay. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple game controller or play symbol.",
-        "filename": "interactive-icon.png"
-    },
-    "cards": {
-        "emoji": "🃏",
-        "prompt": "A minimal, modern icon representing playing cards. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple card or deck symbol.",
-        "filename": "cards-icon.png"
-    },
-    "chips": {
-        "emoji": "💰",
-        "prompt": "A minimal, modern icon representing poker chips or money. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple chip stack or coin symbol.",
-        "filename": "chips-icon.png"
-    },
-    "winner": {
-        "emoji": "👑",
-        "prompt": "A minimal, modern icon representing a winner or champion. Single color gold/yellow icon on transparent background, clean vector style, suitable for dark UI. Simple crown design.",
-        "filename": "winner-icon.png"
-    },
-    "fold": {
-        "emoji": "🚫",
-        "prompt": "A minimal, modern icon representing fold action in poker. Single color red icon on transparent background, clean vector style, suitable for dark UI. Simple X or stop symbol.",
-        "filename": "fold-icon.png"
-    },
-    "check": {
-        "emoji": "✓",
-        "prompt": "A minimal, modern icon representing check action in poker. Single color green icon on transparent background, clean vector style, suitable for dark UI. Simple checkmark.",
-        "filename": "check-icon.png"
-    },
-    "raise": {
-        "emoji": "⬆️",
-        "prompt": "A minimal, modern icon representing raise action in poker. Single color blue icon on transparent background, clean vector style, suitable for dark UI. Simple upward arrow.",
-        "filename": "raise-icon.png"
-    },
-    "allin": {
-        "emoji": "🔥",
-        "prompt": "A minimal, modern icon representing all-in action in poker. Single color orange/red icon on transparent background, clean vector style, suitable for dark UI. Simple flame or explosion symbol.",
-        "filename": "allin-icon.png"
-    },
-    "position": {
-        "emoji": "📍",
-        "prompt": "A minimal, modern icon representing table position in poker. Single color white icon on transparent background, clean vector style, suitable for dark UI. Simple position marker or seat indicator.",
-        "filename": "position-icon.png"
-    }
-}
+client = create_client(API_KEY)
+
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+COMPONENTS_DIR = REPO_ROOT / "src" / "components"
+APP_TSX_PATH = REPO_ROOT / "src" / "App.tsx"
+
+# Response schema for the UI analysis step
+class ColorScheme(BaseModel):
+    primary: str
+    secondary: str
+    accent: str
+    background: str
+    surface: str
+
+class Improvement(BaseModel):
+    area: str
+    current: str
+    suggested: str
+    reason: str
+
+class Typography(BaseModel):
+    headings: str
+    body: str
+
+class UiSuggestions(BaseModel):
+    colorScheme: ColorScheme
+    improvements: list[Improvement]
+    animations: list[str]
+    typography: Typography
+
+# Model used for the UI analysis step
+UI_MODEL = "gemini-3-pro-preview"
 
+# On-disk cache of UI analysis responses, keyed by model + prompt + schema hash
+UI_CACHE_DIR = SCRIPTS_DIR / ".ui_cache"
+
+# Max characters of App.tsx sent to Gemini for analysis
+APP_CODE_MAX_CHARS = 15000
+
+@functools.lru_cache(maxsize=1)
 def read_app_tsx():
-    """Read the main App.tsx file"""
-    app_path = Path(__file__).parent.parent / "src" / "App.tsx"
-    with open(app_path, "r") as f:
-        return f.read()
+    """Read the first APP_CODE_MAX_CHARS characters of the main App.tsx file"""
+    with open(APP_TSX_PATH, "r") as f:
+        return f.read(APP_CODE_MAX_CHARS)
 
-def get_ui_suggestions():
-    """Use Gemini 3 Pro to analyze UI and suggest improvements"""
+def get_ui_suggestions(use_cache: bool = True):
+    """Use Gemini 3 Pro to analyze UI and suggest improvements (cached on disk unless use_cache is False)"""
     print("\n" + "="*60)
     print("STEP 1: Analyzing UI with Gemini 3 Pro")
     print("="*60 + "\n")
@@ -136,7 +110,7 @@ Focus on making it look like a premium, professional poker application.
 Here's a portion of the current UI code (main menu and key components):
 
 ```tsx
-{app_code[:15000]}
+{app_code}
 ```
 
 Respond with a JSON object containing:
@@ -164,100 +138,134 @@ Respond with a JSON object containing:
 }}
 """
 
+    schema = orjson.dumps(UiSuggestions.model_json_schema(), option=orjson.OPT_SORT_KEYS).decode()
+    key = hashlib.sha256((UI_MODEL + prompt + schema).encode()).hexdigest()
+    cache_path = UI_CACHE_DIR / f"{key}.json"
+    if use_cache and cache_path.exists():
+        try:
+            suggestions = UiSuggestions.model_validate_json(cache_path.read_bytes()).model_dump()
+            print(f"Using cached UI analysis: {cache_path.name}")
+            return suggestions
+        except ValueError as e:
+            print(f"Warning: ignoring unreadable UI analysis cache {cache_path.name}: {e}")
+
     try:
         response = client.models.generate_content(
-            model="gemini-3-pro-preview",
+            model=UI_MODEL,
             contents=prompt,
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=UiSuggestions,
+            ),
         )
 
         print("UI Analysis Complete!")
         print("-" * 40)
 
-        # Try to parse JSON from response
-        text = response.text
+        if response.parsed is None:
+            print("Error: response did not match the UI suggestions schema")
+            return None
 
-        # Extract JSON if wrapped in markdown code blocks
-        if "```json" in text:
-            text = text.split("```json")[1].split("```")[0]
-        elif "```" in text:
-            text = text.split("```")[1].split("```")[0]
+        suggestions = response.parsed.model_dump()
+        print(orjson.dumps(suggestions, option=orjson.OPT_INDENT_2).decode())
 
-        try:
-            suggestions = json.loads(text)
-            print(json.dumps(suggestions, indent=2))
-            return suggestions
-        except json.JSONDecodeError:
-            print("Raw suggestions:")
-            print(response.text)
-            return {"raw": response.text}
+        UI_CACHE_DIR.mkdir(exist_ok=True)
+        atomic_write(cache_path, orjson.dumps(suggestions))
+        return suggestions
 
     except Exception as e:
         print(f"Error getting UI suggestions: {e}")
         return None
 
-def generate_icon(name: str, config: dict, output_dir: Path):
-    """Generate a single icon using Nano Banana Pro"""
-    print(f"  Generating {name} icon...")
+async def generate_all_icons(force: bool = False):
+    """Generate all icons concurrently using Nano Banana Pro, returning the icon names in the SVG sprite"""
+    print("\n" + "="*60)
+    print("STEP 2: Generating Icons with Nano Banana Pro")
+    print("="*60 + "\n")
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
-            contents=[config["prompt"]],
-            config=types.GenerateContentConfig(
-                response_modalities=["TEXT", "IMAGE"]
-            )
-        )
+    await icon_generator.generate_all_icons(client, ICONS, ICONS_DIR, force)
+
+    return icon_generator.build_sprite(ICONS, ICONS_DIR)
 
-        for part in response.candidates[0].content.parts:
-            if part.inline_data is not None:
-                # Save the image
-                image_data = part.inline_data.data
-                image_path = output_dir / config["filename"]
+def create_icon_component(sprite_icons: list):
+    """Create a React component for using the generated icons (SVG sprite for traced icons, else <img> tags)"""
+    icon_map = "\n".join(f"  {name}: '{config['filename']}'," for name, config in ICONS.items())
+    if sprite_icons:
+        component_code = SPRITE_COMPONENT_CODE.replace(
+            "__SPRITE_ICONS__", ", ".join(f"'{name}'" for name in sprite_icons)
+        ).replace("__ICON_MAP__", icon_map)
+    else:
+        component_code = IMG_COMPONENT_CODE.replace("__ICON_MAP__", icon_map)
 
-                # Decode and save
-                with open(image_path, "wb") as f:
-                    f.write(image_data)
+    component_path = COMPONENTS_DIR / "PokerIcon.tsx"
+    COMPONENTS_DIR.mkdir(parents=True, exist_ok=True)
 
-                print(f"    Saved: {config['filename']}")
-                return True
+    with open(component_path, "w") as f:
+        f.write(component_code)
 
-        print(f"    Warning: No image generated for {name}")
-        return False
+    print(f"\nCreated icon component: {component_path}")
 
-    except Exception as e:
-        print(f"    Error generating {name}: {e}")
-        return False
+SPRITE_COMPONENT_CODE = '''// Generated Icon Component
+// Renders icons from the generated SVG sprite (public/icons/sprite.svg),
+// falling back to the PNG for icons that could not be traced
 
-def generate_all_icons():
-    """Generate all icons using Nano Banana Pro"""
-    print("\n" + "="*60)
-    print("STEP 2: Generating Icons with Nano Banana Pro")
-    print("="*60 + "\n")
+import React from 'react';
 
-    # Create output directory
-    output_dir = Path(__file__).parent.parent / "public" / "icons"
-    output_dir.mkdir(parents=True, exist_ok=True)
+interface IconProps {
+  name: string;
+  className?: string;
+  size?: number;
+}
+
+const spriteIcons = new Set([__SPRITE_ICONS__]);
+
+const iconBase = `${import.meta.env.BASE_URL}icons/`;
+
+const iconMap: Record<string, string> = {
+__ICON_MAP__
+};
+
+export const PokerIcon: React.FC<IconProps> = ({ name, className = '', size = 24 }) => {
+  const file = iconMap[name];
 
-    print(f"Output directory: {output_dir}\n")
+  if (!file) {
+    console.warn(`Icon not found: ${name}`);
+    return null;
+  }
 
-    successful = 0
-    failed = 0
+  if (!spriteIcons.has(name)) {
+    return (
+      <img
+        src={iconBase + file}
+        alt={name}
+        className={className}
+        style={{ width: size, height: size }}
+      />
+    );
+  }
 
-    for name, config in ICONS_TO_GENERATE.items():
-        if generate_icon(name, config, output_dir):
-            successful += 1
-        else:
-            failed += 1
+  // Sprite icons are filled with currentColor, so set the color via CSS (e.g. text-yellow-400)
+  return (
+    <svg
+      className={className}
+      width={size}
+      height={size}
+      role="img"
+      aria-label={name}
+    >
+      <use href={`${iconBase}sprite.svg#${name}`} />
+    </svg>
+  );
+};
 
-    print(f"\nIcon Generation Complete!")
-    print(f"  Successful: {successful}")
-    print(f"  Failed: {failed}")
+// Usage examples:
+// <PokerIcon name="practice" size={24} />
+// <PokerIcon name="winner" className="inline-block mr-2 text-yellow-400" />
 
-    return output_dir
+export default PokerIcon;
+'''
 
-def create_icon_component():
-    """Create a React component for using the generated icons"""
-    component_code = '''// Generated Icon Component
+IMG_COMPONENT_CODE = '''// Generated Icon Component
 // Replace emojis with these icon images
 
 import React from 'react';
@@ -268,32 +276,23 @@ interface IconProps {
   size?: number;
 }
 
+const iconBase = `${import.meta.env.BASE_URL}icons/`;
+
 const iconMap: Record<string, string> = {
-  practice: '/icons/practice-icon.png',
-  fullgame: '/icons/fullgame-icon.png',
-  tutorial: '/icons/tutorial-icon.png',
-  interactive: '/icons/interactive-icon.png',
-  cards: '/icons/cards-icon.png',
-  chips: '/icons/chips-icon.png',
-  winner: '/icons/winner-icon.png',
-  fold: '/icons/fold-icon.png',
-  check: '/icons/check-icon.png',
-  raise: '/icons/raise-icon.png',
-  allin: '/icons/allin-icon.png',
-  position: '/icons/position-icon.png',
+__ICON_MAP__
 };
 
 export const PokerIcon: React.FC<IconProps> = ({ name, className = '', size = 24 }) => {
-  const src = iconMap[name];
+  const file = iconMap[name];
 
-  if (!src) {
+  if (!file) {
     console.warn(`Icon not found: ${name}`);
     return null;
   }
 
   return (
     <img
-      src={src}
+      src={iconBase + file}
       alt={name}
       className={className}
       style={{ width: size, height: size }}
@@ -308,35 +307,31 @@ export const PokerIcon: React.FC<IconProps> = ({ name, className = '', size = 24
 export default PokerIcon;
 '''
 
-    component_path = Path(__file__).parent.parent / "src" / "components" / "PokerIcon.tsx"
-    component_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(component_path, "w") as f:
-        f.write(component_code)
-
-    print(f"\nCreated icon component: {component_path}")
-
 def main():
+    parser = argparse.ArgumentParser(description="Poker Trainer UI revamp")
+    parser.add_argument("--force", action="store_true", help="Regenerate icons even if they already exist")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the cached UI analysis and call Gemini again")
+    args = parser.parse_args()
+
     print("\n" + "="*60)
     print("  POKER TRAINER UI REVAMP")
     print("  Using Gemini 3 Pro & Nano Banana Pro")
     print("="*60)
 
     # Step 1: Get UI suggestions
-    suggestions = get_ui_suggestions()
+    suggestions = get_ui_suggestions(use_cache=not args.no_cache)
 
     if suggestions:
         # Save suggestions to file
-        suggestions_path = Path(__file__).parent / "ui-suggestions.json"
-        with open(suggestions_path, "w") as f:
-            json.dump(suggestions, indent=2, fp=f)
+        suggestions_path = SCRIPTS_DIR / "ui-suggestions.json"
+        suggestions_path.write_bytes(orjson.dumps(suggestions, option=orjson.OPT_INDENT_2))
         print(f"\nSaved suggestions to: {suggestions_path}")
 
     # Step 2: Generate icons
-    icons_dir = generate_all_icons()
+    sprite_icons = asyncio.run(generate_all_icons(force=args.force))
 
     # Step 3: Create icon component
-    create_icon_component()
+    create_icon_component(sprite_icons)
 
     print("\n" + "="*60)
     print("  UI REVAMP COMPLETE!")
@@ -344,7 +339,7 @@ def main():
     print(f"""
 Next steps:
 1. Review UI suggestions in: scripts/ui-suggestions.json
-2. Icons generated in: {icons_dir}
+2. Icons generated in: {ICONS_DIR}
 3. Icon component created: src/components/PokerIcon.tsx
 
 To use the new icons, import PokerIcon: